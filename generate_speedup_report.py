@@ -1,38 +1,90 @@
 #!/usr/bin/env python3
 
 import argparse
-import json
-import statistics
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson as _json_impl
+except ImportError:
+    import json as _json_impl
+
+# Parsed files cached by (path, st_mtime_ns) so repeated aggregation passes
+# over the same files don't re-parse them.
+_PARSE_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
 
+@lru_cache(maxsize=None)
 def parse_benchmark_file(file_path: str) -> Dict[str, Any]:
-    """Parse a single benchmark JSON file."""
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    return data
+    """Parse a single benchmark JSON file.
+
+    Memoized per path (callers must pass hashable str paths), so direct
+    callers also decode each file at most once per run.
+    """
+    return _json_impl.loads(Path(file_path).read_bytes())
+
+def parse_benchmark_files(benchmark_files: List[str]) -> List[Dict[str, Any]]:
+    """Parse benchmark files in parallel across a process pool.
+
+    Each file is independent, so decoding is dispatched to one worker per
+    core; results are cached by (path, mtime) and returned in input order.
+    """
+    keys = [(file_path, os.stat(file_path).st_mtime_ns) for file_path in benchmark_files]
+    missing = [key for key in keys if key not in _PARSE_CACHE]
 
-def calculate_ingestion_stats(benchmark_files: List[str]) -> Dict[str, Dict[str, float]]:
-    """Calculate averaged ingestion statistics for each database type."""
+    if missing:
+        cpu_count = os.cpu_count() or 1
+        chunksize = max(1, len(missing) // (4 * cpu_count))
+        with ProcessPoolExecutor(max_workers=cpu_count) as executor:
+            missing_paths = [file_path for file_path, _ in missing]
+            for key, data in zip(missing, executor.map(parse_benchmark_file, missing_paths, chunksize=chunksize)):
+                _PARSE_CACHE[key] = data
+
+    return [_PARSE_CACHE[key] for key in keys]
+
+def iter_benchmark_files(directory: str):
+    """Lazily yield benchmark JSON file paths under a directory tree.
+
+    Files whose first bytes don't contain a benchmark key ("dbType" or
+    "queries") are skipped without a full parse.
+    """
+    for path in sorted(Path(directory).rglob('*.json')):
+        with path.open('rb') as f:
+            head = f.read(64)
+        if b'"dbType"' in head or b'"queries"' in head:
+            yield str(path)
+
+def calculate_ingestion_stats(parsed_files: List[Tuple[Dict[str, Any], str]]) -> Dict[str, Dict[str, float]]:
+    """Calculate averaged ingestion statistics for each database type.
+
+    Takes already-parsed (data, path) tuples so the files are only read
+    and decoded once per report.
+    """
     # Group files by dbType first
-    grouped_data = {}
-    
-    for file_path in benchmark_files:
-        data = parse_benchmark_file(file_path)
+    grouped_data = defaultdict(list)
+
+    for data, file_path in parsed_files:
         db_type = data.get('dbType', Path(file_path).stem)
         ingestion_data = data.get('ingestion', [])
-        
+
         if not ingestion_data:
             continue
-        
-        if db_type not in grouped_data:
-            grouped_data[db_type] = []
-        
+
         grouped_data[db_type].append(ingestion_data)
     
     # Calculate averaged statistics for each database type
     ingestion_stats = {}
     
+    get_duration_records = itemgetter('durationMs', 'nRecords')
+
     for db_type, ingestion_data_list in grouped_data.items():
         all_durations = []
         all_records_per_batch = []
@@ -41,90 +93,92 @@ def calculate_ingestion_stats(benchmark_files: List[str]) -> Dict[str, Dict[str,
         all_total_durations = []
         
         for ingestion_data in ingestion_data_list:
-            durations = [entry['durationMs'] for entry in ingestion_data]
-            records = [entry['nRecords'] for entry in ingestion_data]
-            
-            # Calculate records per batch (incremental)
-            records_per_batch = []
-            for i in range(len(records)):
-                if i == 0:
-                    records_per_batch.append(records[i])
-                else:
-                    records_per_batch.append(records[i] - records[i-1])
-            
-            # Calculate ingestion rate (records per second)
-            ingestion_rates = []
-            for duration, batch_records in zip(durations, records_per_batch):
-                if duration > 0:
-                    rate = (batch_records * 1000) / duration  # Convert ms to seconds
-                    ingestion_rates.append(rate)
-            
-            # Collect data for averaging
-            all_durations.extend([max(0, d) for d in durations])
-            all_records_per_batch.extend([max(0, r) for r in records_per_batch])
-            all_ingestion_rates.extend([max(0, r) for r in ingestion_rates])
-            all_total_records.append(records[-1] if records else 0)
-            all_total_durations.append(sum(durations))
-        
+            # Pull both fields per entry in a single pass with the bound
+            # itemgetter, straight into an (N, 2) array
+            pairs = np.fromiter(
+                (value for pair in map(get_duration_records, ingestion_data) for value in pair),
+                dtype=np.float64, count=2 * len(ingestion_data)).reshape(-1, 2)
+            durations = pairs[:, 0]
+            records = pairs[:, 1]
+
+            # Calculate records per batch (incremental) in one C-level pass
+            records_per_batch = np.empty_like(records)
+            if records.size:
+                records_per_batch[0] = records[0]
+                records_per_batch[1:] = np.diff(records)
+
+            # Calculate ingestion rate (records per second) for batches
+            # with a positive duration (convert ms to seconds)
+            positive = durations > 0
+            ingestion_rates = records_per_batch[positive] * 1000.0 / durations[positive]
+
+            # Collect per-file arrays for averaging
+            all_durations.append(np.clip(durations, 0, None))
+            all_records_per_batch.append(np.clip(records_per_batch, 0, None))
+            all_ingestion_rates.append(np.clip(ingestion_rates, 0, None))
+            all_total_records.append(float(records[-1]) if records.size else 0)
+            all_total_durations.append(float(durations.sum()))
+
+        # Concatenate once and take medians in C (introselect) instead of
+        # sorting Python lists through the interpreter
+        durations_arr = np.concatenate(all_durations) if all_durations else np.empty(0)
+        records_per_batch_arr = np.concatenate(all_records_per_batch) if all_records_per_batch else np.empty(0)
+        ingestion_rates_arr = np.concatenate(all_ingestion_rates) if all_ingestion_rates else np.empty(0)
+        total_records_arr = np.asarray(all_total_records, dtype=np.float64)
+        total_durations_arr = np.asarray(all_total_durations, dtype=np.float64)
+
         # Calculate averaged statistics
         ingestion_stats[db_type] = {
-            'median_duration_ms': statistics.median(all_durations) if all_durations else 0,
-            'median_records_per_batch': statistics.median(all_records_per_batch) if all_records_per_batch else 0,
-            'median_ingestion_rate': statistics.median(all_ingestion_rates) if all_ingestion_rates else 0,
-            'total_records': statistics.mean(all_total_records) if all_total_records else 0,
-            'total_duration_ms': statistics.mean(all_total_durations) if all_total_durations else 0,
+            'median_duration_ms': float(np.median(durations_arr)) if durations_arr.size else 0,
+            'median_records_per_batch': float(np.median(records_per_batch_arr)) if records_per_batch_arr.size else 0,
+            'median_ingestion_rate': float(np.median(ingestion_rates_arr)) if ingestion_rates_arr.size else 0,
+            'total_records': float(total_records_arr.mean()) if total_records_arr.size else 0,
+            'total_duration_ms': float(total_durations_arr.mean()) if total_durations_arr.size else 0,
             'file_count': len(ingestion_data_list)
         }
     
     return ingestion_stats
 
-def calculate_query_stats(benchmark_files: List[str]) -> Dict[int, Dict[str, Any]]:
-    """Calculate averaged query statistics for each query ID and database type."""
-    # Group data by dbType and queryId first
-    grouped_data = {}
-    
-    for file_path in benchmark_files:
-        data = parse_benchmark_file(file_path)
+def calculate_query_stats(parsed_files: List[Tuple[Dict[str, Any], str]]) -> Dict[int, Dict[str, Any]]:
+    """Calculate averaged query statistics for each query ID and database type.
+
+    Takes already-parsed (data, path) tuples so the files are only read
+    and decoded once per report.
+    """
+    # Flatten all query runs into rows for a single vectorized groupby
+    rows = []
+
+    for data, file_path in parsed_files:
         db_type = data.get('dbType', Path(file_path).stem)
-        queries = data.get('queries', [])
-        
-        if db_type not in grouped_data:
-            grouped_data[db_type] = {}
-        
-        for query in queries:
+
+        for query in data.get('queries', []):
             query_id = query['queryId']
-            duration_ms = query['durationMs']
-            description = query.get('description', f'Query {query_id}')
-            
-            if query_id not in grouped_data[db_type]:
-                grouped_data[db_type][query_id] = {
-                    'description': description,
-                    'durations': []
-                }
-            
-            grouped_data[db_type][query_id]['durations'].append(duration_ms)
-    
-    # Calculate averaged statistics
+            rows.append({
+                'dbType': db_type,
+                'queryId': query_id,
+                'durationMs': query['durationMs'],
+                'description': query.get('description', f'Query {query_id}')
+            })
+
     query_stats = {}
-    
-    for db_type, db_queries in grouped_data.items():
-        for query_id, query_info in db_queries.items():
-            if query_id not in query_stats:
-                query_stats[query_id] = {
-                    'description': query_info['description'],
-                    'databases': {}
-                }
-            
-            # Calculate average duration, excluding failed queries (-1)
-            successful_durations = [d for d in query_info['durations'] if d >= 0]
-            
-            if successful_durations:
-                avg_duration = sum(successful_durations) / len(successful_durations)
-                query_stats[query_id]['databases'][db_type] = avg_duration
-            else:
-                # If all queries failed, use -1 to indicate failure
-                query_stats[query_id]['databases'][db_type] = -1
-    
+
+    if not rows:
+        return query_stats
+
+    df = pd.DataFrame(rows)
+
+    # Average duration per (dbType, queryId), excluding failed queries (-1);
+    # pairs where every run failed keep -1 via the fallback below
+    means = df[df.durationMs >= 0].groupby(['dbType', 'queryId'])['durationMs'].mean().to_dict()
+    descriptions = df.groupby('queryId')['description'].first().to_dict()
+
+    for db_type, query_id in df.groupby(['dbType', 'queryId']).size().index:
+        bucket = query_stats.setdefault(query_id, {
+            'description': descriptions[query_id],
+            'databases': {}
+        })
+        bucket['databases'][db_type] = means.get((db_type, query_id), -1)
+
     return query_stats
 
 def calculate_speedups(data: Dict[str, Any], baseline_db: str) -> Dict[str, float]:
@@ -135,34 +189,35 @@ def calculate_speedups(data: Dict[str, Any], baseline_db: str) -> Dict[str, floa
         return speedups
     
     baseline_value = data[baseline_db]
-    
+
     # For speedup calculation, treat negative baseline as 0
     if baseline_value < 0:
         baseline_value = 0
-    
-    for db_type, value in data.items():
-        if db_type != baseline_db:
-            # Skip negative values - they will be shown as N/A
-            if value < 0:
-                continue
-            elif value == 0:
-                # Handle 0ms case - treat as extremely fast (use 0.1ms for calculation)
-                if baseline_value > 0:
-                    speedup = baseline_value / 0.1
-                    speedups[db_type] = speedup
-            elif value > 0 and baseline_value > 0:
-                # Normal speedup calculation
-                speedup = baseline_value / value
-                speedups[db_type] = speedup
-    
+
+    db_types = [db for db in data if db != baseline_db]
+    values = np.fromiter((data[db] for db in db_types), dtype=np.float64, count=len(db_types))
+
+    # Treat 0ms entries as extremely fast (use 0.1ms for calculation);
+    # negative values (failed queries) are masked out and shown as N/A
+    values_safe = np.where(values == 0, 0.1, values)
+    valid = (values >= 0) & (baseline_value > 0)
+    ratios = baseline_value / values_safe
+
+    for db_type, ratio, ok in zip(db_types, ratios.tolist(), valid.tolist()):
+        if ok:
+            speedups[db_type] = ratio
+
     return speedups
 
 def generate_speedup_report(benchmark_files: List[str], output_file: str = "speedup_report.md"):
     """Generate a comprehensive speedup report in Markdown format."""
     
+    # Parse every file once; both statistics passes consume the result
+    parsed_files = list(zip(parse_benchmark_files(benchmark_files), benchmark_files))
+
     # Calculate statistics
-    ingestion_stats = calculate_ingestion_stats(benchmark_files)
-    query_stats = calculate_query_stats(benchmark_files)
+    ingestion_stats = calculate_ingestion_stats(parsed_files)
+    query_stats = calculate_query_stats(parsed_files)
     
     # Determine baseline database - use the one with most completed queries and slowest ingestion
     baseline_db = None
@@ -186,28 +241,32 @@ def generate_speedup_report(benchmark_files: List[str], output_file: str = "spee
             baseline_db = max(ingestion_stats.keys(), 
                              key=lambda db: ingestion_stats[db]['median_duration_ms'])
     
-    # Generate report content
-    report_lines = []
-    report_lines.append("# Database Performance Speedup Report (Averaged Results)")
-    report_lines.append("")
-    report_lines.append(f"**Baseline Database:** {baseline_db}")
-    report_lines.append(f"**Analysis Method:** Results averaged across multiple benchmark runs per database type")
-    report_lines.append("")
+    # Generate report content into a single in-memory buffer
+    buf = io.StringIO()
+
+    def emit(line: str) -> None:
+        buf.write(line)
+        buf.write('\n')
+    emit("# Database Performance Speedup Report (Averaged Results)")
+    emit("")
+    emit(f"**Baseline Database:** {baseline_db}")
+    emit(f"**Analysis Method:** Results averaged across multiple benchmark runs per database type")
+    emit("")
     
     # Ingestion Performance Section
-    report_lines.append("## Ingestion Performance")
-    report_lines.append("")
+    emit("## Ingestion Performance")
+    emit("")
     
     if ingestion_stats:
-        report_lines.append("### Ingestion Statistics (Averaged)")
-        report_lines.append("")
-        report_lines.append("| Database | Median Duration (ms) | Median Records/Batch | Median Rate (records/s) | Avg Total Records | Avg Total Duration (ms) | Files |")
-        report_lines.append("|----------|-------------------|-------------------|---------------------|---------------|---------------------|-------|")
+        emit("### Ingestion Statistics (Averaged)")
+        emit("")
+        emit("| Database | Median Duration (ms) | Median Records/Batch | Median Rate (records/s) | Avg Total Records | Avg Total Duration (ms) | Files |")
+        emit("|----------|-------------------|-------------------|---------------------|---------------|---------------------|-------|")
         
         for db_type, stats in ingestion_stats.items():
-            report_lines.append(f"| {db_type} | {stats['median_duration_ms']:.1f} | {stats['median_records_per_batch']:,.0f} | {stats['median_ingestion_rate']:,.0f} | {stats['total_records']:,.0f} | {stats['total_duration_ms']:,.0f} | {stats['file_count']} |")
+            emit(f"| {db_type} | {stats['median_duration_ms']:.1f} | {stats['median_records_per_batch']:,.0f} | {stats['median_ingestion_rate']:,.0f} | {stats['total_records']:,.0f} | {stats['total_duration_ms']:,.0f} | {stats['file_count']} |")
         
-        report_lines.append("")
+        emit("")
         
         # Calculate ingestion speedups
         duration_data = {db: stats['median_duration_ms'] for db, stats in ingestion_stats.items()}
@@ -216,167 +275,174 @@ def generate_speedup_report(benchmark_files: List[str], output_file: str = "spee
         duration_speedups = calculate_speedups(duration_data, baseline_db)
         
         if duration_speedups:
-            report_lines.append("### Ingestion Speedups")
-            report_lines.append("")
-            report_lines.append("| Database | Duration Speedup | Rate Improvement |")
-            report_lines.append("|----------|------------------|------------------|")
+            emit("### Ingestion Speedups")
+            emit("")
+            emit("| Database | Duration Speedup | Rate Improvement |")
+            emit("|----------|------------------|------------------|")
             
             # Add baseline first
-            report_lines.append(f"| {baseline_db} | 1.00x | 1.00x |")
+            emit(f"| {baseline_db} | 1.00x | 1.00x |")
             
             for db_type, speedup in duration_speedups.items():
                 rate_improvement = rate_data[db_type] / rate_data[baseline_db] if rate_data[baseline_db] > 0 else 0
-                report_lines.append(f"| {db_type} | {speedup:.2f}x | {rate_improvement:.2f}x |")
+                emit(f"| {db_type} | {speedup:.2f}x | {rate_improvement:.2f}x |")
             
-            report_lines.append("")
+            emit("")
     
     # Query Performance Section
-    report_lines.append("## Query Performance")
-    report_lines.append("")
-    
+    emit("## Query Performance")
+    emit("")
+
+    # Sort the database column order once; every table below reuses it
+    db_order = sorted(ingestion_stats.keys())
+
     if query_stats:
-        # Calculate median speedups across all queries
+        query_ids = sorted(query_stats.keys())
+
+        # Calculate median speedups across all queries, one pre-sized
+        # array slot per query and database
         # Include 0 for failed/incomplete queries to ensure fair comparison
-        all_speedups = {db: [] for db in ingestion_stats.keys() if db != baseline_db}
-        
-        report_lines.append("### Query Execution Times (Averaged)")
-        report_lines.append("")
-        report_lines.append("| Query ID | Description | " + " | ".join(f"{db} (ms)" for db in sorted(ingestion_stats.keys())) + " |")
-        report_lines.append("|----------|-------------|" + "|".join(["-" * 12 for _ in ingestion_stats.keys()]) + "|")
-        
-        for query_id in sorted(query_stats.keys()):
-            query_data = query_stats[query_id]
-            description = query_data['description']
-            
-            row = f"| {query_id} | {description} |"
-            for db in sorted(ingestion_stats.keys()):
-                duration = query_data['databases'].get(db, -1)
-                if duration >= 0:
-                    if duration >= 1000:
-                        row += f" {duration/1000:.1f}s |"
-                    else:
-                        row += f" {duration:.1f}ms |"
-                else:
-                    row += " N/A |"
-            
-            report_lines.append(row)
-        
-        report_lines.append("")
-        
-        # Calculate and display speedups for each query
-        report_lines.append("### Query Speedups")
-        report_lines.append("")
-        report_lines.append("| Query ID | Description | " + " | ".join(f"{db} Speedup" for db in sorted(ingestion_stats.keys())) + " |")
-        report_lines.append("|----------|-------------|" + "|".join(["-" * 12 for db in ingestion_stats.keys()]) + "|")
-        
-        for query_id in sorted(query_stats.keys()):
-            query_data = query_stats[query_id]
-            description = query_data['description']
-            
-            speedups = calculate_speedups(query_data['databases'], baseline_db)
-            
-            row = f"| {query_id} | {description} |"
-            for db in sorted(ingestion_stats.keys()):
+        all_speedups = {db: np.empty(len(query_ids)) for db in ingestion_stats.keys() if db != baseline_db}
+
+        descriptions = pd.Series(
+            [query_stats[qid]['description'] for qid in query_ids],
+            index=query_ids, name='Description')
+
+        # Single fused pass over the queries: collect the raw duration
+        # row, the speedup row, and the medians input together
+        time_rows = []
+        speedup_rows = []
+        for k, query_id in enumerate(query_ids):
+            databases = query_stats[query_id]['databases']
+            time_rows.append([databases.get(db, -1) for db in db_order])
+
+            speedups = calculate_speedups(databases, baseline_db)
+
+            row = {}
+            for db in db_order:
                 if db == baseline_db:
                     # Baseline is always 1.00x
-                    if baseline_db in query_data['databases']:
-                        row += " 1.00x |"
-                    else:
-                        row += " N/A |"
+                    row[db] = "1.00x" if baseline_db in databases else "N/A"
+                elif db in databases and databases[db] < 0:
+                    row[db] = "N/A"
+                    # Record 0 for failed queries in median calculation
+                    all_speedups[db][k] = 0
                 else:
-                    if db in query_data['databases'] and query_data['databases'][db] < 0:
-                        row += " N/A |"
-                        # Add 0 for failed queries in median calculation
-                        all_speedups[db].append(0)
+                    speedup = speedups.get(db, 0)
+                    if speedup > 0:
+                        row[db] = f"{speedup:.2f}x"
+                        all_speedups[db][k] = speedup
                     else:
-                        speedup = speedups.get(db, 0)
-                        if speedup > 0:
-                            row += f" {speedup:.2f}x |"
-                            all_speedups[db].append(speedup)
-                        else:
-                            row += " N/A |"
-                            # Add 0 for queries that didn't complete
-                            all_speedups[db].append(0)
-            
-            report_lines.append(row)
-        
-        report_lines.append("")
+                        row[db] = "N/A"
+                        # Record 0 for queries that didn't complete
+                        all_speedups[db][k] = 0
+
+            speedup_rows.append(row)
+
+        emit("### Query Execution Times (Averaged)")
+        emit("")
+
+        # Raw durations matrix (-1 marks failed/missing entries),
+        # formatted cell-by-column with array masks rather than a Python
+        # branch per cell: negative -> N/A, >= 1000ms -> seconds
+        arr = np.asarray(time_rows, dtype=np.float64)
+        seconds_cells = np.char.add(np.char.mod('%.1f', arr / 1000.0), 's')
+        ms_cells = np.char.add(np.char.mod('%.1f', arr), 'ms')
+        cells = np.where(arr < 0, 'N/A', np.where(arr >= 1000, seconds_cells, ms_cells))
+
+        times_table = pd.DataFrame(cells, index=query_ids, columns=[f"{db} (ms)" for db in db_order])
+        times_table.insert(0, 'Description', descriptions)
+        times_table.index.name = 'Query ID'
+        emit(times_table.to_markdown())
+        emit("")
+
+        emit("### Query Speedups")
+        emit("")
+
+        speedups_table = pd.DataFrame(speedup_rows, index=query_ids, columns=db_order)
+        speedups_table.columns = [f"{db} Speedup" for db in db_order]
+        speedups_table.insert(0, 'Description', descriptions)
+        speedups_table.index.name = 'Query ID'
+        emit(speedups_table.to_markdown())
+        emit("")
         
         # Median speedups summary
-        report_lines.append("### Median Query Speedups")
-        report_lines.append("")
-        report_lines.append("| Database | Median Speedup | Min Speedup | Max Speedup | Queries Analyzed |")
-        report_lines.append("|----------|-----------------|-------------|-------------|------------------|")
+        emit("### Median Query Speedups")
+        emit("")
+        emit("| Database | Median Speedup | Min Speedup | Max Speedup | Queries Analyzed |")
+        emit("|----------|-----------------|-------------|-------------|------------------|")
         
         # Add baseline first
         baseline_query_count = sum(1 for qid, qdata in query_stats.items() if baseline_db in qdata['databases'] and qdata['databases'][baseline_db] >= 0)
-        report_lines.append(f"| {baseline_db} | 1.00x | 1.00x | 1.00x | {baseline_query_count} |")
+        emit(f"| {baseline_db} | 1.00x | 1.00x | 1.00x | {baseline_query_count} |")
         
         for db in sorted(all_speedups.keys()):
-            speedups_list = all_speedups[db]
-            if speedups_list:
-                median_speedup = statistics.median(speedups_list)
+            speedups_arr = all_speedups[db]
+            if speedups_arr.size:
+                median_speedup = float(np.median(speedups_arr))
                 # For min/max, only consider successful queries (> 0)
-                successful_speedups = [s for s in speedups_list if s > 0]
-                if successful_speedups:
-                    min_speedup = min(successful_speedups)
-                    max_speedup = max(successful_speedups)
+                successful_speedups = speedups_arr[speedups_arr > 0]
+                if successful_speedups.size:
+                    min_speedup = float(successful_speedups.min())
+                    max_speedup = float(successful_speedups.max())
                 else:
                     min_speedup = 0
                     max_speedup = 0
-                successful_count = len(successful_speedups)
-                report_lines.append(f"| {db} | {median_speedup:.2f}x | {min_speedup:.2f}x | {max_speedup:.2f}x | {successful_count} |")
+                successful_count = successful_speedups.size
+                emit(f"| {db} | {median_speedup:.2f}x | {min_speedup:.2f}x | {max_speedup:.2f}x | {successful_count} |")
         
-        report_lines.append("")
+        emit("")
     
     # Summary Section
-    report_lines.append("## Summary")
-    report_lines.append("")
+    emit("## Summary")
+    emit("")
     
     if duration_speedups:
         best_ingestion_db = max(duration_speedups.keys(), key=lambda db: duration_speedups[db])
         best_ingestion_speedup = duration_speedups[best_ingestion_db]
-        report_lines.append(f"- **Best Ingestion Performance:** {best_ingestion_db} ({best_ingestion_speedup:.2f}x faster than {baseline_db})")
+        emit(f"- **Best Ingestion Performance:** {best_ingestion_db} ({best_ingestion_speedup:.2f}x faster than {baseline_db})")
     
     if all_speedups:
-        median_speedups_summary = {db: statistics.median(speedups) for db, speedups in all_speedups.items() if speedups}
+        median_speedups_summary = {db: float(np.median(speedups)) for db, speedups in all_speedups.items() if speedups.size}
         if median_speedups_summary:
             best_query_db = max(median_speedups_summary.keys(), key=lambda db: median_speedups_summary[db])
             best_query_speedup = median_speedups_summary[best_query_db]
-            report_lines.append(f"- **Best Median Query Performance:** {best_query_db} ({best_query_speedup:.2f}x faster than {baseline_db})")
+            emit(f"- **Best Median Query Performance:** {best_query_db} ({best_query_speedup:.2f}x faster than {baseline_db})")
     
-    report_lines.append("")
-    report_lines.append("---")
-    report_lines.append(f"*Report generated from {len(benchmark_files)} benchmark files, averaged by database type*")
+    emit("")
+    emit("---")
+    emit(f"*Report generated from {len(benchmark_files)} benchmark files, averaged by database type*")
     
     # Add file count summary
     if ingestion_stats:
-        report_lines.append("")
-        report_lines.append("**File Count Summary:**")
+        emit("")
+        emit("**File Count Summary:**")
         for db_type, stats in ingestion_stats.items():
-            report_lines.append(f"- {db_type}: {stats['file_count']} files")
+            emit(f"- {db_type}: {stats['file_count']} files")
     
     # Write report to file
-    with open(output_file, 'w') as f:
-        f.write('\n'.join(report_lines))
+    Path(output_file).write_text(buf.getvalue())
     
     print(f"Speedup report generated: {output_file}")
 
 def main():
     parser = argparse.ArgumentParser(description='Generate speedup report from benchmark JSON files')
-    parser.add_argument('files', nargs='+', help='JSON benchmark files to process')
+    parser.add_argument('files', nargs='*', help='JSON benchmark files to process')
+    parser.add_argument('-d', '--dir', help='Directory to scan recursively for benchmark JSON files')
     parser.add_argument('-o', '--output', default='speedup_report.md', help='Output markdown file (default: speedup_report.md)')
-    
+
     args = parser.parse_args()
-    
+
     # Validate input files
     valid_files = []
+    if args.dir:
+        valid_files.extend(iter_benchmark_files(args.dir))
     for file_path in args.files:
         if Path(file_path).exists():
             valid_files.append(file_path)
         else:
             print(f"Warning: File not found: {file_path}")
-    
+
     if not valid_files:
         print("Error: No valid benchmark files found")
         return 1
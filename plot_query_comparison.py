@@ -1,159 +1,234 @@
 #!/usr/bin/env python3
 
-import json
+import matplotlib
+matplotlib.use('Agg')  # headless rendering, skips GUI backend init
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import os
 
-def parse_benchmark_files(file_paths: List[str]) -> Dict[str, Any]:
-    """Parse benchmark JSON files and organize data by query ID, averaging results by dbType."""
-    # First, collect all data grouped by dbType and queryId
-    grouped_data = {}
-    
-    for file_path in file_paths:
-        with open(file_path, 'r') as f:
-            benchmark_data = json.load(f)
-        
+try:
+    import orjson as _json_impl
+except ImportError:
+    import json as _json_impl
+
+# Parsed files cached by (path, st_mtime_ns) so repeated passes over the
+# same files don't re-parse them.
+_PARSE_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+COLOR_MAP = {
+    'postgres': '#336791',
+    'questdb': '#FF6B35',
+    'timescaledb': '#FDB462',
+    'influxdb': '#22577A',
+    'clickhouse': '#FF9F1C',
+    'cratedb': '#2E8B57'
+}
+
+# Reused figure/axes, one per worker process (see _render_query)
+_RENDER_FIG = None
+
+def _load_benchmark_file(file_path: str) -> Dict[str, Any]:
+    """Parse a single benchmark JSON file (top-level so it is picklable)."""
+    return _json_impl.loads(Path(file_path).read_bytes())
+
+def _load_benchmark_files(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """Parse benchmark files in parallel across a process pool.
+
+    Each file is independent, so decoding is dispatched to one worker per
+    core; results are cached by (path, mtime) and returned in input order.
+    """
+    keys = [(file_path, os.stat(file_path).st_mtime_ns) for file_path in file_paths]
+    missing = [key for key in keys if key not in _PARSE_CACHE]
+
+    if missing:
+        cpu_count = os.cpu_count() or 1
+        chunksize = max(1, len(missing) // (4 * cpu_count))
+        with ProcessPoolExecutor(max_workers=cpu_count) as executor:
+            missing_paths = [file_path for file_path, _ in missing]
+            for key, data in zip(missing, executor.map(_load_benchmark_file, missing_paths, chunksize=chunksize)):
+                _PARSE_CACHE[key] = data
+
+    return [_PARSE_CACHE[key] for key in keys]
+
+def iter_benchmark_files(directory: str):
+    """Lazily yield benchmark JSON file paths under a directory tree.
+
+    Files whose first bytes don't contain a benchmark key ("dbType" or
+    "queries") are skipped without a full parse.
+    """
+    for path in sorted(Path(directory).rglob('*.json')):
+        with path.open('rb') as f:
+            head = f.read(64)
+        if b'"dbType"' in head or b'"queries"' in head:
+            yield str(path)
+
+def parse_benchmark_files(file_paths: List[str]) -> Tuple[Dict[str, Any], Dict[str, int], List[str]]:
+    """Parse benchmark JSON files and organize data by query ID, averaging results by dbType.
+
+    Returns (query_data, db_file_counts, all_databases) so callers don't
+    have to walk the files again for the per-database bookkeeping.
+    """
+    # Flatten all query runs into rows for a single vectorized groupby,
+    # counting files per database type along the way
+    rows = []
+    db_file_counts = defaultdict(int)
+
+    for file_path, benchmark_data in zip(file_paths, _load_benchmark_files(file_paths)):
         db_type = benchmark_data.get('dbType', Path(file_path).stem)
-        queries = benchmark_data.get('queries', [])
-        
-        if db_type not in grouped_data:
-            grouped_data[db_type] = {}
-        
-        for query in queries:
+        db_file_counts[db_type] += 1
+
+        for query in benchmark_data.get('queries', []):
             query_id = query['queryId']
-            duration_ms = query['durationMs']
-            description = query.get('description', f'Query {query_id}')
-            
-            if query_id not in grouped_data[db_type]:
-                grouped_data[db_type][query_id] = {
-                    'description': description,
-                    'durations': []
-                }
-            
-            grouped_data[db_type][query_id]['durations'].append(duration_ms)
-    
-    # Now calculate averages and organize by query ID
+            rows.append({
+                'dbType': db_type,
+                'queryId': query_id,
+                'durationMs': query['durationMs'],
+                'description': query.get('description', f'Query {query_id}')
+            })
+
     data = {}
-    
-    for db_type, db_queries in grouped_data.items():
-        for query_id, query_info in db_queries.items():
-            if query_id not in data:
-                data[query_id] = {
-                    'description': query_info['description'],
-                    'databases': {}
-                }
-            
-            # Calculate average duration, excluding failed queries (-1)
-            successful_durations = [d for d in query_info['durations'] if d >= 0]
-            
-            if successful_durations:
-                avg_duration = sum(successful_durations) / len(successful_durations)
-                data[query_id]['databases'][db_type] = avg_duration
-            else:
-                # If all queries failed, use -1 to indicate failure
-                data[query_id]['databases'][db_type] = -1
-    
-    return data
 
-def create_query_barplots(benchmark_files: List[str], output_dir: str = "query_plots"):
+    if not rows:
+        return data, db_file_counts, []
+
+    df = pd.DataFrame(rows)
+
+    # Average duration per (dbType, queryId), excluding failed queries (-1);
+    # pairs where every run failed keep -1 via the fallback below
+    means = df[df.durationMs >= 0].groupby(['dbType', 'queryId'])['durationMs'].mean().to_dict()
+    descriptions = df.groupby('queryId')['description'].first().to_dict()
+
+    for db_type, query_id in df.groupby(['dbType', 'queryId']).size().index:
+        bucket = data.setdefault(query_id, {
+            'description': descriptions[query_id],
+            'databases': {}
+        })
+        bucket['databases'][db_type] = means.get((db_type, query_id), -1)
+
+    # Consistent database ordering for the plots
+    all_databases = sorted(df['dbType'].unique().tolist())
+
+    return data, db_file_counts, all_databases
+
+def _render_query(query_id: int, data: Dict[str, Any], all_databases: List[str],
+                  output_dir: str, fmt: str = 'svg', dpi: int = 150) -> Optional[str]:
+    """Render the barplot for one query (top-level so it is picklable).
+
+    Returns the output path, or None when the query has no valid data.
+    The figure is created once per worker process and reused between
+    tasks; the Agg backend selected at import keeps workers headless.
+    """
+    global _RENDER_FIG
+
+    description = data['description']
+
+    # Prepare data for plotting
+    databases = []
+    durations = []
+    colors = []
+
+    for db in all_databases:
+        if db in data['databases']:
+            duration = data['databases'][db]
+            # Skip queries with -1 duration (failed/timeout)
+            if duration >= 0:
+                databases.append(db)
+                durations.append(duration)
+                colors.append(COLOR_MAP.get(db, '#888888'))
+
+    # Skip empty queries (all failed)
+    if not databases:
+        return None
+
+    if _RENDER_FIG is None:
+        _RENDER_FIG = plt.subplots(figsize=(12, 6))
+    fig, ax = _RENDER_FIG
+
+    # Draw the plot on the reused axes
+    ax.clear()
+    bars = ax.bar(databases, durations, color=colors, alpha=0.8, edgecolor='black', linewidth=0.5)
+
+    # Add value labels on bars
+    for bar, duration in zip(bars, durations):
+        height = bar.get_height()
+        if duration >= 1000:
+            label = f'{duration/1000:.1f}s'
+        else:
+            label = f'{duration:.1f}ms'
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                label, ha='center', va='bottom', fontweight='bold')
+
+    # Customize the plot
+    ax.set_title(f'Query {query_id}: {description} (Averaged Results)', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Database', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Average Execution Time (ms)', fontsize=12, fontweight='bold')
+    ax.set_yscale('log' if any(d > 1000 for d in durations) else 'linear')
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Fixed margins instead of bbox_inches='tight', which renders every
+    # figure twice just to measure the bounding box
+    fig.subplots_adjust(left=0.08, right=0.98, top=0.88, bottom=0.12)
+
+    # Save the plot; matplotlib picks the writer from the extension.
+    # Vector formats ignore dpi; for PNG a light zlib compression level
+    # keeps encoding cheap
+    output_file = f"{output_dir}/query_{query_id:02d}_comparison.{fmt}"
+    if fmt == 'png':
+        fig.savefig(output_file, dpi=dpi, pil_kwargs={'compress_level': 1})
+    else:
+        fig.savefig(output_file)
+
+    return output_file
+
+def create_query_barplots(benchmark_files: List[str], output_dir: str = "query_plots",
+                          fmt: str = 'svg', dpi: int = 150):
     """Create individual barplots for each query ID showing averaged time per database."""
     
     # Create output directory if it doesn't exist
     Path(output_dir).mkdir(exist_ok=True)
     
-    # Parse all benchmark data (now returns averaged results)
-    query_data = parse_benchmark_files(benchmark_files)
-    
-    # Count files per database type for display
-    db_file_counts = {}
-    for file_path in benchmark_files:
-        with open(file_path, 'r') as f:
-            benchmark_data = json.load(f)
-        db_type = benchmark_data.get('dbType', Path(file_path).stem)
-        db_file_counts[db_type] = db_file_counts.get(db_type, 0) + 1
-    
-    # Get all database types for consistent ordering
-    all_databases = set()
-    for query_id, data in query_data.items():
-        all_databases.update(data['databases'].keys())
-    all_databases = sorted(list(all_databases))
-    
-    # Create a plot for each query ID
-    for query_id in sorted(query_data.keys()):
-        data = query_data[query_id]
-        description = data['description']
-        
-        # Prepare data for plotting
-        databases = []
-        durations = []
-        colors = []
-        
-        color_map = {
-            'postgres': '#336791',
-            'questdb': '#FF6B35', 
-            'timescaledb': '#FDB462',
-            'influxdb': '#22577A',
-            'clickhouse': '#FF9F1C',
-            'cratedb': '#2E8B57'
-        }
-        
-        for db in all_databases:
-            if db in data['databases']:
-                duration = data['databases'][db]
-                # Skip queries with -1 duration (failed/timeout)
-                if duration >= 0:
-                    databases.append(db)
-                    durations.append(duration)
-                    colors.append(color_map.get(db, '#888888'))
-        
-        # Skip empty queries (all failed)
-        if not databases:
-            print(f"Skipping Query {query_id}: No valid data")
-            continue
-        
-        # Create the plot
-        plt.figure(figsize=(12, 6))
-        bars = plt.bar(databases, durations, color=colors, alpha=0.8, edgecolor='black', linewidth=0.5)
-        
-        # Add value labels on bars
-        for bar, duration in zip(bars, durations):
-            height = bar.get_height()
-            if duration >= 1000:
-                label = f'{duration/1000:.1f}s'
+    # Parse all benchmark data (averaged results plus the per-database
+    # file counts and ordering, all from the same file walk)
+    query_data, db_file_counts, all_databases = parse_benchmark_files(benchmark_files)
+
+    # Render one plot per worker; PNG encoding is CPU-bound and the
+    # queries are fully independent
+    query_ids = sorted(query_data.keys())
+    cpu_count = os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=cpu_count) as executor:
+        results = executor.map(_render_query, query_ids,
+                               (query_data[query_id] for query_id in query_ids),
+                               repeat(all_databases), repeat(output_dir), repeat(fmt), repeat(dpi))
+
+        for query_id, output_file in zip(query_ids, results):
+            if output_file:
+                print(f"Created plot for Query {query_id}: {output_file}")
             else:
-                label = f'{duration:.1f}ms'
-            plt.text(bar.get_x() + bar.get_width()/2., height,
-                    label, ha='center', va='bottom', fontweight='bold')
-        
-        # Customize the plot
-        plt.title(f'Query {query_id}: {description} (Averaged Results)', fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel('Database', fontsize=12, fontweight='bold')
-        plt.ylabel('Average Execution Time (ms)', fontsize=12, fontweight='bold')
-        plt.yscale('log' if any(d > 1000 for d in durations) else 'linear')
-        plt.grid(True, alpha=0.3, axis='y')
-        plt.tight_layout()
-        
-        # Save the plot
-        output_file = f"{output_dir}/query_{query_id:02d}_comparison.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"Created plot for Query {query_id}: {output_file}")
+                print(f"Skipping Query {query_id}: No valid data")
 
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Create barplot comparisons for each query ID from benchmark JSON files')
-    parser.add_argument('files', nargs='+', help='JSON benchmark files to process')
+    parser.add_argument('files', nargs='*', help='JSON benchmark files to process')
+    parser.add_argument('-d', '--dir', help='Directory to scan recursively for benchmark JSON files')
     parser.add_argument('-o', '--output', default='query_plots', help='Output directory for the plots (default: query_plots)')
-    
+    parser.add_argument('--format', choices=['png', 'svg', 'pdf'], default='svg', help='Output format for the plots (default: svg)')
+    parser.add_argument('--dpi', type=int, default=150, help='Resolution of the saved plots, PNG only (default: 150)')
+
     args = parser.parse_args()
-    
+
     # Validate input files
     valid_files = []
+    if args.dir:
+        valid_files.extend(iter_benchmark_files(args.dir))
     for file_path in args.files:
         if Path(file_path).exists():
             valid_files.append(file_path)
@@ -165,7 +240,7 @@ def main():
         return 1
     
     print(f"Processing {len(valid_files)} benchmark files (averaging by dbType)...")
-    create_query_barplots(valid_files, args.output)
+    create_query_barplots(valid_files, args.output, fmt=args.format, dpi=args.dpi)
     print(f"All averaged query comparison plots created successfully in {args.output}/!")
     
     return 0